@@ -3,6 +3,7 @@
 # ---------------------------------------------------------------
 # Implements the Red-Blue Nim game following AIMA-style structure.
 # Each game state is represented as a tuple: (num_red, num_blue, to_move)
+# where to_move is a player id (COMPUTER = 0, HUMAN = 1).
 # ---------------------------------------------------------------
 # Methods correspond to textbook notation:
 #   S0             → initial state
@@ -13,6 +14,17 @@
 #   UTILITY(s, p)  → utility(state, player)
 # ===============================================================
 
+from array import array
+
+# Player ids used in game states; PLAYERS maps an id back to its name.
+COMPUTER, HUMAN = 0, 1
+PLAYERS = ("computer", "human")
+
+# Every action in the game, larger takes first.  This is the order
+# ACTIONS(s) lists moves in and the order the searches try them in.
+ALL_ACTIONS = (("red", 2), ("blue", 2), ("red", 1), ("blue", 1))
+
+
 class RedBlueNim:
     
 
@@ -48,11 +60,99 @@ class RedBlueNim:
 
         Attributes:
             version (str):  The rule variant ("standard" or "misere").
-            initial (tuple): The initial game state (num_red, num_blue, to_move).
+            initial (tuple): The initial game state (num_red, num_blue, to_move),
+                             with to_move as a player id.
+            key_bits (int): Bits needed to hold either pile count, used
+                            when packing states into integer keys.
+            sign (int): +1 for standard, -1 for misère; a terminal state
+                        is worth sign * (2 * red + 3 * blue) to the
+                        player to move in it.
+
+        Raises:
+            ValueError: If version is not "standard" or "misere", or
+                        first_player is not "computer" or "human".
         """
 
+        if first_player not in PLAYERS:
+            raise ValueError(f"unknown first player {first_player!r}: expected 'computer' or 'human'")
+
         self.version = version
-        self.initial = (num_red, num_blue, first_player)  # (R, B, to_move)
+        self.initial = (num_red, num_blue, PLAYERS.index(first_player))  # (R, B, to_move)
+        self.key_bits = max(num_red, num_blue).bit_length()
+        # Standard: the player who just moved emptied a pile and lost, so
+        # the player now to move wins.  Misère flips that.
+        signs = {"standard": 1, "misere": -1}
+        if version not in signs:
+            raise ValueError(f"unknown version {version!r}: expected 'standard' or 'misere'")
+        self.sign = signs[version]
+
+        # Legal actions depend only on whether each pile holds 0, 1 or
+        # 2+ marbles, so build the 9 possible tuples once up front.
+        self._ACTIONS = {}
+        for r in range(3):
+            for b in range(3):
+                counts = {"red": r, "blue": b}
+                self._ACTIONS[(r, b)] = tuple(
+                    (pile, count) for pile, count in ALL_ACTIONS if counts[pile] >= count
+                )
+
+        # The solved tables behind best_move() cost O(R·B) time and memory,
+        # and only full-depth play needs them, so they are built on first use.
+        self._best = None
+
+    # ------------------------------------------------------------
+    # Helper: SOLVE the whole game bottom-up
+    # ------------------------------------------------------------
+    def _solve(self, num_red, num_blue):
+        """
+        Compute the exact minimax value and best action of every position.
+
+        Every move shrinks a pile, so filling the table in increasing
+        order of red and blue only ever reads entries that are already
+        final.  Values are for the player to move; they do not depend on
+        *which* player that is, since utility is zero-sum and symmetric.
+
+        Both tables are flat typed arrays indexed by red * (num_blue + 1)
+        + blue: _value holds the values (int64) and _best the index in
+        ALL_ACTIONS of the best action (int8, -1 for terminal states).
+        Ties go to the action listed first in ALL_ACTIONS.
+
+        Args:
+            num_red (int):  Largest red pile to solve for.
+            num_blue (int): Largest blue pile to solve for.
+        """
+        sign = self.sign
+        width = num_blue + 1
+        size = (num_red + 1) * width
+        value = array("q", bytes(8 * size))
+        best = array("b", [-1]) * size
+
+        # (action index, red taken, blue taken, offset in the flat table)
+        moves = []
+        for i, (pile, count) in enumerate(ALL_ACTIONS):
+            take_red = count if pile == "red" else 0
+            take_blue = count if pile == "blue" else 0
+            moves.append((i, take_red, take_blue, take_red * width + take_blue))
+
+        for r in range(num_red + 1):
+            for b in range(width):
+                k = r * width + b
+                if r == 0 or b == 0:
+                    # The opponent just emptied a pile: standard → mover wins.
+                    value[k] = sign * (2 * r + 3 * b)
+                    continue
+                best_value, best_action = None, -1
+                for i, take_red, take_blue, offset in moves:
+                    if r >= take_red and b >= take_blue:
+                        v = -value[k - offset]
+                        if best_value is None or v > best_value:
+                            best_value, best_action = v, i
+                value[k] = best_value
+                best[k] = best_action
+
+        self._width = width
+        self._value = value
+        self._best = best
 
     # ------------------------------------------------------------
     # TO-MOVE(s)
@@ -65,7 +165,7 @@ class RedBlueNim:
             state (tuple): Current game state (red, blue, to_move).
 
         Returns:
-            str: "computer" or "human" indicating the player to move next.
+            int: COMPUTER or HUMAN, the id of the player to move next.
         """
         return state[2]
 
@@ -74,32 +174,21 @@ class RedBlueNim:
     # ------------------------------------------------------------
     def actions(self, state):
         """
-        Return the list of all legal actions available in state s.
+        Return all legal actions available in state s.
 
         Each legal action is represented as a tuple (pile, count),
         where 'pile' ∈ {"red", "blue"} and count ∈ {1, 2}.
-        Only moves that remove available marbles are included.
+        Only moves that remove available marbles are included, and
+        larger takes are listed first.
 
         Args:
             state (tuple): Current game state (red, blue, to_move).
 
         Returns:
-            list[tuple]: All valid moves in this state.
-                         e.g., [("red", 1), ("blue", 2)]
+            tuple[tuple]: All valid moves in this state.
+                          e.g., (("blue", 2), ("red", 1))
         """
-        red, blue, _ = state
-        legal_moves = []
-
-        if red >= 1:
-            legal_moves.append(("red", 1))
-        if red >= 2:
-            legal_moves.append(("red", 2))
-        if blue >= 1:
-            legal_moves.append(("blue", 1))
-        if blue >= 2:
-            legal_moves.append(("blue", 2))
-
-        return legal_moves
+        return self._ACTIONS[(min(state[0], 2), min(state[1], 2))]
 
     # ------------------------------------------------------------
     # RESULT(s, a)
@@ -108,6 +197,10 @@ class RedBlueNim:
         """
         Apply action a in state s and return the resulting state.
 
+        Used by the driver once per move played.  The searches and the
+        solver work on the pile counts directly and never build
+        intermediate state tuples, so this is not on any hot path.
+
         Args:
             state (tuple):  The current game state (red, blue, to_move).
             action (tuple): A valid action (pile, count).
@@ -124,7 +217,7 @@ class RedBlueNim:
         elif pile == "blue":
             blue -= count
 
-        next_player = "human" if to_move == "computer" else "computer"
+        next_player = 1 - to_move
         return (red, blue, next_player)
 
     # ------------------------------------------------------------
@@ -155,23 +248,36 @@ class RedBlueNim:
             - Standard: player loses if pile is empty → negative score
             - Misère: player wins if pile is empty → positive score
         Score = ±(2 * red + 3 * blue)
+
+        Args:
+            state (tuple): A terminal game state (red, blue, to_move).
+            player (int): COMPUTER or HUMAN.
         """
         red, blue, to_move = state
-        score = 2 * red + 3 * blue
+        score = self.sign * (2 * red + 3 * blue)
+        return score if to_move == player else -score
+
+    # ------------------------------------------------------------
+    # Helper: BEST-MOVE(s)
+    # ------------------------------------------------------------
+    def best_move(self, state):
+        """
+        Return an optimal action for the player to move, without search.
 
-        if self.version == "standard":
-        # The player who just moved caused empty pile → loses
-            if to_move != player:
-                return -score
-            else:
-                return score
+        Reads the action chosen for this position by _solve(), which runs
+        on the first call and covers every position up to the initial piles.
 
-        elif self.version == "misere":
-            # The player who just moved caused empty pile → wins
-            if to_move != player:
-                return score
-            else:
-                return -score
+        Args:
+            state (tuple): Current game state (red, blue, to_move).
+
+        Returns:
+            tuple: The optimal action (pile, count), or None if the
+                   state is terminal.
+        """
+        if self._best is None:
+            self._solve(self.initial[0], self.initial[1])
+        i = self._best[state[0] * self._width + state[1]]
+        return None if i < 0 else ALL_ACTIONS[i]
 
     # ------------------------------------------------------------
     # Helper: DISPLAY(s)
@@ -187,5 +293,5 @@ class RedBlueNim:
             Prints the number of red and blue marbles and the next player.
         """
         red, blue, to_move = state
-        print(f"Red marbles: {red} | Blue marbles: {blue} | To move: {to_move}")
+        print(f"Red marbles: {red} | Blue marbles: {blue} | To move: {PLAYERS[to_move]}")
 
@@ -2,7 +2,13 @@
 # minimax.py
 # ---------------------------------------------------------------
 # Implements MINIMAX, ALPHA-BETA, and DEPTH-LIMITED ALPHA-BETA
-# search algorithms exactly following the pseudocode mentioned in Russell & Norvig (2021).
+# search algorithms following the pseudocode mentioned in Russell & Norvig (2021).
+# ALPHA-BETA and DEPTH-LIMITED ALPHA-BETA share a single NEGAMAX
+# search: MAX-VALUE and MIN-VALUE are the same computation with the
+# sign flipped, so every value is taken from the perspective of the
+# player to move at that node.  The search runs on an explicit stack;
+# a recursive version of the same function is kept as a reference.
+# MINIMAX-SEARCH is a plain minimax memoized with lru_cache.
 #
 # Each function includes docstrings describing:
 #   • Purpose (as in the textbook definition)
@@ -10,262 +16,422 @@
 #   • Return values (utility, move)
 # ===============================================================
 
-import math
+import sys
+from functools import lru_cache
 
+from game import ALL_ACTIONS
 
 # ---------------------------------------------------------------
-# 1️  MINIMAX-SEARCH (basic version)
+# TRANSPOSITION TABLE
 # ---------------------------------------------------------------
-def minimax_search(game, state):
-    """
-    Perform a complete MINIMAX search for the given game state.
+# A dict owned by the caller and passed to every search, so positions
+# solved while choosing one move are reused for the next.  It maps a
+# state key to (value, flag, best_move), where best_move is an index
+# into game.ALL_ACTIONS (or None).  The flag records whether the stored
+# value is the EXACT minimax value, a LOWER bound (search failed high)
+# or an UPPER bound (search failed low).
+# Keys pack a node into a single int so a probe hashes one int instead
+# of a tuple.  Layout (low to high): `bits` bits of blue, `bits` bits of
+# red, then the depth code: 0 for full search, remaining depth + 1 for
+# depth-limited search.  A depth limit that cannot be reached from a
+# node is stored as full search (code 0).  The player to move is not
+# part of the key: neither the utility nor the heuristic depends on who
+# is to move, only on the piles.  Values depend on the game's version,
+# so a table must only be shared within one game.
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Integer stand-in for ±∞: every utility and eval value is far smaller,
+# and keeping the window as ints avoids mixed int/float comparisons.
+INF = sys.maxsize
 
-    Implements the textbook MINIMAX-SEARCH(game, state) algorithm
-    from Russell & Norvig (AIMA).
 
-    Args:
-        game: An instance of a game class implementing
-              TO-MOVE(s), ACTIONS(s), RESULT(s, a),
-              IS-TERMINAL(s), and UTILITY(s, p).
-        state: The current game state tuple (red, blue, to_move).
+# ---------------------------------------------------------------
+# NEGAMAX (shared by the alpha-beta searches)
+# ---------------------------------------------------------------
+# Every action as (index into ALL_ACTIONS, red taken, blue taken).  The
+# search works directly on the pile counts, so RESULT and ACTIONS reduce
+# to a subtraction and a bounds check.
+_MOVES = tuple(
+    (i, count if pile == "red" else 0, count if pile == "blue" else 0)
+    for i, (pile, count) in enumerate(ALL_ACTIONS)
+)
+
+# ALL_ACTIONS lists two-marble takes first, which is also the static
+# search order: counting searched nodes over all 24 orders, it does the
+# least work under the depth-limited heuristic and is within a few
+# percent of the best order for exhaustive search.
+#
+# _MOVE_ORDERS[i] is _MOVES with move i tried first; used to search the
+# best move recorded in the transposition table before the others.
+_MOVE_ORDERS = tuple((m,) + tuple(o for o in _MOVES if o is not m) for m in _MOVES)
 
-    Returns:
-        move: The optimal action for the current player to take
-              according to the Minimax decision rule.
+
+def negamax(red, blue, alpha, beta, depth, sign, bits, tt):
     """
-    player = game.to_move(state)
-    value, move = max_value(game, state, player)
-    return move
+    Compute the value of a state for the player to move in it.
+
+    Iterative form of negamax_recursive(): instead of one Python call
+    per node, the nodes on the current search path are kept on an
+    explicit stack.  This avoids a frame allocation per node and the
+    interpreter's recursion limit for large piles.
 
+    The current node lives in local variables.  Descending into a child
+    pushes the parent's locals as a tuple; when the child's value is
+    known, the parent is popped, the negated value folded in, and the
+    next child (if any, and no cutoff) is searched.  Children that are
+    leaves are scored in the parent's loop without being pushed at all.
 
-def max_value(game, state, player):
+    Args and Returns are the same as for negamax_recursive().
     """
-    Compute the maximum expected utility for the maximizing player.
+    stack = []
+    while True:
+        # Enter the node: leaves and TT hits resolve to a value at once.
+        value = None
+        if red == 0 or blue == 0:
+            value = sign * (2 * red + 3 * blue)
+        elif depth == 0:
+            value = -(2 * red + 3 * blue)
+        else:
+            if depth is not None and depth >= red + blue - 1:
+                depth = None  # the whole subtree fits within the limit
+            depth_code = 0 if depth is None else depth + 1
+            key = (((depth_code << bits) | red) << bits) | blue
+            tt_move = None
+            entry = tt.get(key)
+            if entry is not None:
+                tt_value, flag, tt_move = entry
+                if flag == EXACT:
+                    value = tt_value
+                else:
+                    if flag == LOWER:
+                        alpha = max(alpha, tt_value)
+                    else:
+                        beta = min(beta, tt_value)
+                    if alpha >= beta:
+                        value = tt_value
+            if value is None:
+                alpha_orig = alpha
+                v = -INF
+                best_move = None
+                moves = _MOVES if tt_move is None else _MOVE_ORDERS[tt_move]
+                i = 0
+
+        # Unwind: hand values to parents until a node has a child to search.
+        while True:
+            if value is None:
+                # Leaf children (terminal, or at the depth limit) are scored
+                # right here; only interior children are pushed and entered.
+                move = None
+                while alpha < beta and i < len(moves):
+                    candidate, take_red, take_blue = moves[i]
+                    i += 1
+                    if red < take_red or blue < take_blue:
+                        continue
+                    child_red = red - take_red
+                    child_blue = blue - take_blue
+                    if child_red == 0 or child_blue == 0:
+                        child_value = -sign * (2 * child_red + 3 * child_blue)
+                    elif depth == 1:
+                        child_value = 2 * child_red + 3 * child_blue
+                    else:
+                        move = candidate
+                        break
+                    if child_value > v:
+                        v, best_move = child_value, candidate
+                    alpha = max(alpha, v)
+                if move is not None:
+                    # Even the last child cannot replace this frame in
+                    # place: its value must still be folded into v and
+                    # this node's TT entry written.  A tuple push/pop is
+                    # also cheaper here than reusing preallocated frames.
+                    stack.append((red, blue, alpha, beta, depth,
+                                  key, alpha_orig, v, best_move, moves, i, move))
+                    red = child_red
+                    blue = child_blue
+                    alpha, beta = -beta, -alpha
+                    if depth is not None:
+                        depth -= 1
+                    break
+
+                # Children exhausted or cut off: this node's value is final.
+                if v <= alpha_orig:
+                    flag = UPPER
+                elif v >= beta:
+                    flag = LOWER
+                else:
+                    flag = EXACT
+                tt[key] = (v, flag, best_move)
+                value = v
+
+            if not stack:
+                return value
+            (red, blue, alpha, beta, depth,
+             key, alpha_orig, v, best_move, moves, i, move) = stack.pop()
+            value = -value
+            if value > v:
+                v, best_move = value, move
+            alpha = max(alpha, v)
+            value = None
+
+
+def negamax_recursive(red, blue, alpha, beta, depth, sign, bits, tt):
+    """
+    Compute the value of a state for the player to move in it.
+
+    Recursive reference version of negamax(); both compute the same
+    values and fill tt identically, so this one is kept for checking
+    the iterative search against.
+
+    Single recursive replacement for the MAX-VALUE / MIN-VALUE pair:
+    the value of a state for its mover is the maximum over actions of
+    the *negated* value of the successor for the opponent.  Alpha and
+    beta are likewise swapped and negated at each ply.
 
-    This corresponds to the MAX-VALUE function in AIMA pseudocode.
+    The Red-Blue Nim model (IS-TERMINAL, UTILITY, ACTIONS, RESULT) is
+    inlined on the pile counts to avoid per-node method calls.
 
     Args:
-        game: The game environment object.
-        state: Current game state (tuple).
-        player: The player whose perspective the utility is evaluated from.
+        red (int): Red marbles remaining.
+        blue (int): Blue marbles remaining.
+        alpha (int): Lower bound of the search window (mover's view).
+        beta (int): Upper bound of the search window (mover's view).
+        depth (int | None): Remaining depth limit, or None for full search.
+        sign (int): +1 for the standard version, -1 for misère; the
+                    terminal utility for the mover is sign * (2r + 3b).
+        bits (int): Width of each pile field in the packed TT key.
+        tt (dict): Transposition table, read and updated in place.
 
     Returns:
-        (utility, move): A tuple containing the best achievable utility
-                         value and the corresponding move for MAX.
+        int: The value for the player to move.  The best move of every
+             interior node is left in tt rather than returned, so the
+             recursion passes a single int instead of a tuple.
     """
-    if game.is_terminal(state):
-        return game.utility(state, player), None
-
-    v = -math.inf
+    if red == 0 or blue == 0:
+        # The opponent just emptied a pile: standard → mover wins.
+        return sign * (2 * red + 3 * blue)
+    if depth == 0:
+        # Heuristic (see eval_function.txt): the more marbles left, the
+        # worse for the player who must keep moving.
+        return -(2 * red + 3 * blue)
+
+    # No line of play from (red, blue) lasts more than red + blue - 1
+    # plies, so a limit at least that deep never reaches the heuristic: the
+    # node's value is its exact value and it can share the full-search
+    # TT entry instead of one entry per remaining depth.
+    if depth is not None and depth >= red + blue - 1:
+        depth = None
+    depth_code = 0 if depth is None else depth + 1
+    key = (((depth_code << bits) | red) << bits) | blue
+    tt_move = None
+    entry = tt.get(key)
+    if entry is not None:
+        tt_value, flag, tt_move = entry
+        if flag == EXACT:
+            return tt_value
+        if flag == LOWER:
+            alpha = max(alpha, tt_value)
+        elif flag == UPPER:
+            beta = min(beta, tt_value)
+        if alpha >= beta:
+            return tt_value
+    alpha_orig = alpha
+
+    child_depth = None if depth is None else depth - 1
+    v = -INF
     best_move = None
-    for a in game.actions(state):
-        v2, _ = min_value(game, game.result(state, a), player)
+    moves = _MOVES if tt_move is None else _MOVE_ORDERS[tt_move]
+    for move, take_red, take_blue in moves:
+        if red < take_red or blue < take_blue:
+            continue
+        child_red = red - take_red
+        child_blue = blue - take_blue
+        # Score leaf children here rather than paying for a call.
+        if child_red == 0 or child_blue == 0:
+            v2 = -sign * (2 * child_red + 3 * child_blue)
+        elif child_depth == 0:
+            v2 = 2 * child_red + 3 * child_blue
+        else:
+            v2 = -negamax_recursive(child_red, child_blue, -beta, -alpha,
+                                    child_depth, sign, bits, tt)
         if v2 > v:
-            v, best_move = v2, a
-    return v, best_move
+            v, best_move = v2, move
+        alpha = max(alpha, v)
+        if alpha >= beta:  # cutoff
+            break
+
+    if v <= alpha_orig:
+        flag = UPPER
+    elif v >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    tt[key] = (v, flag, best_move)
+    return v
 
 
-def min_value(game, state, player):
+def _search(game, state, depth=None, tt=None):
     """
-    Compute the minimum expected utility for the minimizing player.
+    Run negamax from `state` with a full window and return its best move.
 
-    This corresponds to the MIN-VALUE function in AIMA pseudocode.
+    An EXACT root entry left by an earlier search already holds the
+    optimal move.  Any other root entry is discarded first, so the root
+    is searched with an unbounded window and always ends up EXACT.
 
     Args:
         game: The game environment object.
         state: Current game state (tuple).
-        player: The player whose perspective the utility is evaluated from.
+        depth (int | None): Depth limit, or None for full search.
+        tt (dict | None): Transposition table to reuse; a fresh one is
+                          used when None.
 
     Returns:
-        (utility, move): A tuple containing the best achievable utility
-                         value and the corresponding move for MIN.
+        move: The best action (pile, count), or None if no move was searched.
     """
-    if game.is_terminal(state):
-        return game.utility(state, player), None
+    if tt is None:
+        tt = {}
+    red, blue, _ = state
+    if depth is not None and depth >= red + blue - 1:
+        depth = None  # as in negamax: the limit is never reached
 
-    v = math.inf
-    best_move = None
-    for a in game.actions(state):
-        v2, _ = max_value(game, game.result(state, a), player)
-        if v2 < v:
-            v, best_move = v2, a
-    return v, best_move
+    depth_code = 0 if depth is None else depth + 1
+    key = (((depth_code << game.key_bits) | red) << game.key_bits) | blue
+    entry = tt.get(key)
+    if entry is not None and entry[1] != EXACT:
+        del tt[key]
+    negamax(red, blue, -INF, INF, depth, game.sign, game.key_bits, tt)
+
+    entry = tt.get(key)
+    return None if entry is None else ALL_ACTIONS[entry[2]]
 
 
 # ---------------------------------------------------------------
-# 2️  ALPHA-BETA-SEARCH (with pruning)
+# 1️  MINIMAX-SEARCH (basic version)
 # ---------------------------------------------------------------
-def alpha_beta_search(game, state):
+# Largest (red, blue) whose whole rectangle of positions minimax_value
+# has cached, per sign.  Every successor of a position inside it is
+# inside it too, so searches from there need no filling at all.
+_filled = {}
+
+
+@lru_cache(maxsize=None)
+def minimax_value(red, blue, sign):
     """
-    Perform MINIMAX search using Alpha–Beta pruning.
+    Return the exact MINIMAX value of (red, blue) for the player to move.
 
-    Implements ALPHA-BETA-SEARCH(game, state) from AIMA,
-    which reduces the number of nodes explored without
-    affecting the final result.
+    Plain minimax with no alpha-beta window, so its result depends only
+    on its arguments and lru_cache can act as the transposition table:
+    each position is expanded once, across searches and games alike.
+
+    An uncached call recurses once per ply, up to red + blue deep, which
+    exceeds the interpreter's recursion limit for large piles.  Call it
+    through minimax_search(), which fills the cache bottom-up first.
 
     Args:
-        game: The game environment object.
-        state: Current game state (tuple).
+        red (int): Red marbles remaining.
+        blue (int): Blue marbles remaining.
+        sign (int): +1 for the standard version, -1 for misère (game.sign).
 
     Returns:
-        move: The optimal move for the player to move next.
+        int: The value of the position for the player to move.
     """
-    player = game.to_move(state)
-    value, move = max_value_ab(game, state, player, -math.inf, math.inf)
-    return move
+    if red == 0 or blue == 0:
+        return sign * (2 * red + 3 * blue)
+    v = -INF
+    for _, take_red, take_blue in _MOVES:
+        if red >= take_red and blue >= take_blue:
+            v = max(v, -minimax_value(red - take_red, blue - take_blue, sign))
+    return v
 
 
-def max_value_ab(game, state, player, alpha, beta):
+def minimax_search(game, state):
     """
-    Compute the MAX-VALUE for Alpha–Beta search.
+    Perform a complete MINIMAX search for the given game state.
 
-    Prunes branches where beta ≤ alpha to improve efficiency.
+    Implements the textbook MINIMAX-SEARCH(game, state) algorithm
+    from Russell & Norvig (AIMA): each action is scored by the
+    memoized minimax value of its successor.
 
     Args:
-        game: The game environment object.
-        state: Current game state (tuple).
-        player: The reference player whose utility is evaluated.
-        alpha (float): The best value found so far for MAX.
-        beta (float): The best value found so far for MIN.
+        game: An instance of a game class implementing
+              TO-MOVE(s), ACTIONS(s), RESULT(s, a),
+              IS-TERMINAL(s), and UTILITY(s, p).
+        state: The current game state tuple (red, blue, to_move).
 
     Returns:
-        (utility, move): The best utility and move for MAX from this node.
+        move: The optimal action for the current player to take
+              according to the Minimax decision rule.
     """
-    if game.is_terminal(state):
-        return game.utility(state, player), None
-
-    v = -math.inf
-    best_move = None
-    for a in game.actions(state):
-        v2, _ = min_value_ab(game, game.result(state, a), player, alpha, beta)
-        if v2 > v:
-            v, best_move = v2, a
-        alpha = max(alpha, v)
-        if v >= beta:  # β cutoff
-            break
-    return v, best_move
+    red, blue, _ = state
+    if red == 0 or blue == 0:
+        return None
+
+    # Fill the cache in increasing red and blue, the order used by
+    # RedBlueNim._solve: every successor of a position is then already
+    # cached, so no call recurses more than one level deep.  Positions
+    # inside the rectangle filled by an earlier call are skipped.
+    sign = game.sign
+    filled_red, filled_blue = _filled.get(sign, (-1, -1))
+    if red > filled_red or blue > filled_blue:
+        top_red, top_blue = max(red, filled_red), max(blue, filled_blue)
+        for r in range(top_red + 1):
+            for b in range(filled_blue + 1 if r <= filled_red else 0, top_blue + 1):
+                minimax_value(r, b, sign)
+        _filled[sign] = (top_red, top_blue)
+
+    best_value, best_move = -INF, None
+    for move, take_red, take_blue in _MOVES:
+        if red >= take_red and blue >= take_blue:
+            v = -minimax_value(red - take_red, blue - take_blue, sign)
+            if v > best_value:
+                best_value, best_move = v, move
+    return None if best_move is None else ALL_ACTIONS[best_move]
 
 
-def min_value_ab(game, state, player, alpha, beta):
+# ---------------------------------------------------------------
+# 2️  ALPHA-BETA-SEARCH (with pruning)
+# ---------------------------------------------------------------
+def alpha_beta_search(game, state, tt=None):
     """
-    Compute the MIN-VALUE for Alpha–Beta search.
+    Perform MINIMAX search using Alpha–Beta pruning.
 
-    Prunes branches where beta ≤ alpha to improve efficiency.
+    Implements ALPHA-BETA-SEARCH(game, state) from AIMA,
+    which reduces the number of nodes explored without
+    affecting the final result.
 
     Args:
         game: The game environment object.
         state: Current game state (tuple).
-        player: The reference player whose utility is evaluated.
-        alpha (float): The current best value for MAX.
-        beta (float): The current best value for MIN.
+        tt (dict | None): Transposition table kept between calls for the
+                          same game; a fresh one is used when None.
 
     Returns:
-        (utility, move): The best utility and move for MIN from this node.
+        move: The optimal move for the player to move next.
     """
-    if game.is_terminal(state):
-        return game.utility(state, player), None
-
-    v = math.inf
-    best_move = None
-    for a in game.actions(state):
-        v2, _ = max_value_ab(game, game.result(state, a), player, alpha, beta)
-        if v2 < v:
-            v, best_move = v2, a
-        beta = min(beta, v)
-        if v <= alpha:  # α cutoff
-            break
-    return v, best_move
+    return _search(game, state, tt=tt)
 
 
 # ---------------------------------------------------------------
 # 3️  DEPTH-LIMITED ALPHA-BETA (Extra Credit)
 # ---------------------------------------------------------------
-def alpha_beta_limited(game, state, depth_limit, eval_fn):
+def alpha_beta_limited(game, state, depth_limit, tt=None):
     """
     Perform a depth-limited Alpha–Beta search.
 
     Used when full search to terminal states is infeasible.
-    At depth == 0 or terminal nodes, uses a heuristic evaluation
-    function to estimate the utility value.
+    Terminal states are scored with UTILITY; at depth == 0 the
+    heuristic -(2 * red + 3 * blue) for the player to move estimates
+    the utility value (see eval_function.txt).  It is computed inline
+    in negamax rather than through a callable.
 
     Args:
         game: Game environment implementing the AIMA methods.
         state: Current game state (tuple).
         depth_limit (int): Maximum search depth (number of plies).
-        eval_fn (callable): Heuristic evaluation function taking
-                            (state, player) → numeric value.
+        tt (dict | None): Transposition table kept between calls for the
+                          same game; a fresh one is used when None.
 
     Returns:
         move: The best move determined by the depth-limited search.
     """
-    player = game.to_move(state)
-    value, move = max_value_dl(game, state, player, -math.inf, math.inf, depth_limit, eval_fn)
-    return move
-
-
-def max_value_dl(game, state, player, alpha, beta, depth, eval_fn):
-    """
-    Compute MAX-VALUE for the depth-limited Alpha–Beta algorithm.
-
-    Stops searching further when depth == 0, returning
-    eval_fn(state, player) as an approximate utility.
-
-    Args:
-        game: The game environment.
-        state: Current state (tuple).
-        player: The reference player for evaluation.
-        alpha (float): Alpha bound.
-        beta (float): Beta bound.
-        depth (int): Remaining depth limit.
-        eval_fn (callable): Evaluation function.
-
-    Returns:
-        (utility, move): Estimated utility and best move.
-    """
-    if game.is_terminal(state) or depth == 0:
-        return eval_fn(state, player), None
-
-    v = -math.inf
-    best_move = None
-    for a in game.actions(state):
-        v2, _ = min_value_dl(game, game.result(state, a), player, alpha, beta, depth - 1, eval_fn)
-        if v2 > v:
-            v, best_move = v2, a
-        alpha = max(alpha, v)
-        if v >= beta:  # β cutoff
-            break
-    return v, best_move
-
-
-def min_value_dl(game, state, player, alpha, beta, depth, eval_fn):
-    """
-    Compute MIN-VALUE for the depth-limited Alpha–Beta algorithm.
-
-    Stops searching further when depth == 0, returning
-    eval_fn(state, player) as an approximate utility.
-
-    Args:
-        game: The game environment.
-        state: Current state (tuple).
-        player: The reference player for evaluation.
-        alpha (float): Alpha bound.
-        beta (float): Beta bound.
-        depth (int): Remaining depth limit.
-        eval_fn (callable): Evaluation function.
-
-    Returns:
-        (utility, move): Estimated utility and best move.
-    """
-    if game.is_terminal(state) or depth == 0:
-        return eval_fn(state, player), None
-
-    v = math.inf
-    best_move = None
-    for a in game.actions(state):
-        v2, _ = max_value_dl(game, game.result(state, a), player, alpha, beta, depth - 1, eval_fn)
-        if v2 < v:
-            v, best_move = v2, a
-        beta = min(beta, v)
-        if v <= alpha:  # α cutoff
-            break
-    return v, best_move
+    return _search(game, state, depth_limit, tt)
@@ -15,26 +15,8 @@
 # ---------------------------------------------------------------
 
 import sys
-from game import RedBlueNim
-from minimax import minimax_search, alpha_beta_search, alpha_beta_limited
-
-
-# ---------------------------------------------------------------
-# EVALUATION FUNCTION for depth-limited Alpha-Beta (Extra Credit)
-# ---------------------------------------------------------------
-def eval_fn(state, player):
-    """
-    Simple heuristic evaluation function.
-    Estimates goodness of a non-terminal state based on remaining marbles.
-    Lower marble count is worse for the player whose turn it is.
-    """
-    red, blue, to_move = state
-    value = 2 * red + 3 * blue
-    # Favor states where the opponent faces fewer marbles
-    if to_move == player:
-        return -value
-    else:
-        return value
+from game import RedBlueNim, COMPUTER, HUMAN, PLAYERS
+from minimax import minimax_search, alpha_beta_limited
 
 
 # ---------------------------------------------------------------
@@ -73,25 +55,36 @@ def main():
     depth = int(args[4]) if len(args) == 5 else None
 
     # Initialize game
-    game = RedBlueNim(num_red, num_blue, version, first_player)
+    try:
+        game = RedBlueNim(num_red, num_blue, version, first_player)
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Usage: python red_blue_nim.py <num-red> <num-blue> [version] [first-player] [depth]")
+        return
     state = game.initial
 
     print("\n===== Red-Blue Nim =====")
     print(f"Version: {version} | First player: {first_player} | Depth: {depth if depth else 'Full search'}\n")
 
+    # One transposition table for the whole game: positions solved
+    # while choosing one move are reused by every later search.
+    # (Full-depth play needs none: the first best_move() call solves
+    # every position once, and later calls just read the answer.)
+    tt = {}
+
     # Game loop
     while not game.is_terminal(state):
         game.display(state)
         current_player = game.to_move(state)
 
-        if current_player == "human":
+        if current_player == HUMAN:
             move = get_human_move(game, state)
         else:
             print("\nComputer thinking...\n")
             if depth is not None:
-                move = alpha_beta_limited(game, state, depth, eval_fn)
+                move = alpha_beta_limited(game, state, depth, tt)
             else:
-                move = alpha_beta_search(game, state)
+                move = game.best_move(state)
             print(f"Computer chooses: {move}\n")
 
         # Apply the move
@@ -100,8 +93,8 @@ def main():
     # Game over
     game.display(state)
     print("\n===== Game Over =====")
-    for player in ["computer", "human"]:
-        print(f"{player.capitalize()} utility: {game.utility(state, player)}")
+    for player in (COMPUTER, HUMAN):
+        print(f"{PLAYERS[player].capitalize()} utility: {game.utility(state, player)}")
 
 
 # ---------------------------------------------------------------